@@ -39,9 +39,7 @@ class Deblink(object):
         for b in blinks:
             # Interpolate from the point before start_index -- no averaging.
             if b.start_index > 0:
-                prev_pt = pc[b.start_index-1]
-                for point in pc[(b.start_index):(b.end_index+1)]:
-                    pc.copy_measures(prev_pt, point)
+                pc.hold_measures(b.start_index-1, b.start_index, b.end_index+1)
 
         return pc
 
@@ -176,21 +174,25 @@ class Denoise(object):
         starts = np.where(edges > 0)[0]
         ends = np.where(edges < 0)[0]
         lengths = ends - starts
-        # And now, the things to correct are no longer than max_noise
-        idxs_to_correct = np.where(lengths <= self.max_noise_samples)[0]
-        for c_idx in idxs_to_correct:
-            # Find the interp values...
-            known_x = [starts[c_idx]-1, ends[c_idx]]
-            interp_x = range(starts[c_idx], ends[c_idx])
-            # At this point, IndexErrors are OK -- they'll only fire
-            # on the last point.
-            try:
-                interp_y = np.interp(interp_x, known_x, arr[known_x])
-                # And save the data
-                for i in range(len(interp_x)):
-                    arr[interp_x[i]] = interp_y[i]
-            except IndexError:
-                pass
+        # And now, the things to correct are no longer than max_noise -- and
+        # don't run off the end of the data, with nothing to interpolate to.
+        to_correct = np.logical_and(
+            lengths <= self.max_noise_samples, ends < len(arr))
+        starts = starts[to_correct]
+        ends = ends[to_correct]
+        lengths = lengths[to_correct]
+        # Expand every run into its indexes, each paired with the known
+        # points on either side of its run.
+        known_before = np.repeat(starts-1, lengths)
+        known_after = np.repeat(ends, lengths)
+        run_offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        interp_x = (
+            np.repeat(starts, lengths) + np.arange(lengths.sum()) - run_offsets)
+        # Linear interpolation, all the runs at once.
+        slopes = ((arr[known_after] - arr[known_before]) /
+            (known_after - known_before).astype(float))
+        arr[interp_x] = (
+            slopes * (interp_x - known_before) + arr[known_before])
         return arr
 
 
@@ -6,7 +6,9 @@
 # Written by Nathan Vack <njvack@wisc.edu> at the Waisman Laborotory
 # for Brain Imaging and Behavior, University of Wisconsin - Madison.
 
+import array
 import copy
+import operator
 import numpy as np
 
 
@@ -15,6 +17,9 @@ class Point(object):
     A point with x, y, and time coordinates -- one point in a scan path
     """
 
+    # Scanpaths can hold millions of these; slots keep them small.
+    __slots__ = ('x', 'y', 'time', 'duration')
+
     interp_attrs = ('x', 'y')
 
     def __init__(self, x=None, y=None, time=None, duration=1.0):
@@ -68,6 +73,10 @@ class Point(object):
 class IViewPoint(Point):
     """ A point from the iView system. """
 
+    __slots__ = (
+        'set', 'pupil_h', 'pupil_v', 'corneal_reflex_h', 'corneal_reflex_v',
+        'diam_h', 'diam_v')
+
     # All of the continuous measures that can be interpolated
     interp_attrs = (
         'x', 'y', 'pupil_h', 'pupil_v', 'corneal_reflex_h', 'corneal_reflex_v',
@@ -85,109 +94,321 @@ class IViewPoint(Point):
         self.diam_v = diam_v
 
 
+class IViewFixation(Point):
+    """ A fixation from iView's fixation export. """
+
+    __slots__ = ('start_num', 'end_num', 'end_time', 'object')
+
+
+def _set_attributes(point):
+    """ Return the names of all the attributes that are set on point """
+    names = []
+    for cls in type(point).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if name not in names and hasattr(point, name):
+                names.append(name)
+    names.extend(getattr(point, '__dict__', {}).keys())
+    return names
+
+
 class Scanpath(object):
-    """ A set of Points arranged sequentially in time """
+    """
+    A set of Points arranged sequentially in time.
+
+    Point data is stored column-wise -- one numpy array per attribute -- and
+    Points are only built when they're asked for. Those Points are copies;
+    changing them won't change the scanpath.
+
+    The column arrays are read-only, since values like total_duration are
+    computed from them once and cached. Arrays passed in as arrays= (a dict
+    of attribute name to sequence) get copied, so the caller's own arrays
+    stay writable and changing them doesn't reach the scanpath.
+    """
     uniformely_sampled = False # Subclass to make this true.
 
-    def __init__(self, points=[], headers = {}):
+    def __init__(self, points=None, headers=None, arrays=None,
+        point_type=Point):
         self.continuous_measures = ('x', 'y')
         self.time_measures = ('time', 'duration')
         self.measures = self.continuous_measures + self.time_measures
-        
-        self.points = points
-        self.headers = headers
+
+        self.point_type = point_type
+        if arrays is None:
+            self.points = [] if points is None else points
+        else:
+            self._set_arrays(dict(
+                (name, np.array(arr)) for name, arr in arrays.items()))
+        self.headers = {} if headers is None else headers
+
+    @property
+    def points(self):
+        return list(self)
+
+    @points.setter
+    def points(self, points):
+        """
+        Convert a list of Points into our column arrays. The first point
+        decides the point type and which attributes get stored, so every
+        point needs at least the attributes of the first; anything extra on
+        later points is dropped. Points missing one raise ValueError.
+        """
+        attrs = self.measures
+        columns = [[] for attr in attrs]
+        if len(points) > 0:
+            self.point_type = type(points[0])
+            attrs = _set_attributes(points[0])
+            # One attrgetter call per point, then transpose into columns
+            getter = operator.attrgetter(*attrs)
+            try:
+                columns = zip(*[getter(p) for p in points])
+            except AttributeError, e:
+                raise ValueError(
+                    "Points must all have the attributes of the first (%s): %s"
+                    % (", ".join(attrs), e))
+        self._set_arrays(dict(
+            (attr, np.array(col)) for attr, col in zip(attrs, columns)))
+
+    def _set_arrays(self, arrays):
+        """
+        Replace our column arrays, locking them read-only. Everything that
+        changes the point data comes through here, so this is where cached
+        values get thrown out.
+        """
+        for arr in arrays.values():
+            arr.flags.writeable = False
+        self._arrays = arrays
+        self._total_duration = None
 
     def __len__(self):
-        return self.points.__len__()
+        return len(self._arrays['x'])
 
     def __iter__(self):
-        return self.points.__iter__()
+        names = self._arrays.keys()
+        columns = [self._arrays[name].tolist() for name in names]
+        for values in zip(*columns):
+            yield self._build_point(zip(names, values))
 
     def __getitem__(self, i):
-        return self.points[i]
+        if isinstance(i, slice):
+            return self._with_arrays(
+                dict((name, arr[i]) for name, arr in self._arrays.items()))
+        # item() hands back a plain Python value without making a 0-d array
+        return self._build_point(
+            (name, arr.item(i)) for name, arr in self._arrays.items())
 
     def __getslice__(self, i, j):
-        return Scanpath(self.points[i:j])
+        return self.__getitem__(slice(i, j))
+
+    def _column(self, name):
+        return self._arrays[name]
+
+    def _build_point(self, attr_pairs):
+        point = self.point_type()
+        for attr, val in attr_pairs:
+            setattr(point, attr, val)
+        return point
+
+    def _with_arrays(self, arrays):
+        return Scanpath(arrays=arrays, point_type=self.point_type)
+
+    def _masked(self, mask):
+        return self._with_arrays(
+            dict((name, arr[mask]) for name, arr in self._arrays.items()))
 
     def extend(self, sp):
-        self.points.extend(sp.points)
+        """
+        Append sp's points to ours. Extending with an empty scanpath does
+        nothing, and an empty scanpath takes on sp's attributes and point
+        type; otherwise, the two must have the same attributes, or this
+        raises ValueError.
+        """
+        if len(sp) == 0:
+            return
+        if len(self) == 0:
+            self.point_type = sp.point_type
+            self._set_arrays(dict(
+                (name, arr.copy()) for name, arr in sp._arrays.items()))
+            return
+        if set(self._arrays) != set(sp._arrays):
+            raise ValueError(
+                "Can't extend a scanpath of %s with one of %s" %
+                (sorted(self._arrays), sorted(sp._arrays)))
+        self._set_arrays(dict(
+            (name, np.concatenate((arr, sp._arrays[name])))
+            for name, arr in self._arrays.items()))
 
     def valid_points(self, criterion):
-        return Scanpath(
-            [point for point in self.points if criterion(point)])
+        """
+        Return the points matching criterion -- either a function of one
+        point or a boolean array, such as within_bounds_mask() returns.
+        """
+        mask = criterion
+        if callable(criterion):
+            mask = np.array([criterion(point) for point in self], dtype=bool)
+        return self._masked(mask)
+
+    def time_midpoints(self):
+        """ Every point's time_midpoint(), as an array """
+        # Under Python 2, / floor-divides integer arrays just as it does
+        # ints, so integer durations give the same midpoints as
+        # Point.time_midpoint() -- which is what during() relies on to pick
+        # the same points the old per-point Combiner did.
+        return self._column('time') + (self._column('duration') / 2)
+
+    def during(self, start, end):
+        """
+        Return the points whose time midpoints fall in [start, end), keeping
+        our headers.
+        """
+        mid = self.time_midpoints()
+        sp = self._masked(np.logical_and(mid >= start, mid < end))
+        sp.headers = self.headers
+        return sp
+
+    def within_bounds_mask(self, bounds, exclude_zero=False):
+        """
+        Point.within() for the whole path: a boolean array, True for points
+        inside or on the border of bounds, an (x1, y1, x2, y2) tuple.
+        """
+        x1, y1, x2, y2 = bounds
+        x, y = self._column('x'), self._column('y')
+        mask = (x >= x1) & (x <= x2) & (y >= y1) & (y <= y2)
+        if exclude_zero:
+            mask &= ~((x == 0) & (y == 0))
+        return mask
 
     def mean(self):
-        val = np.apply_along_axis(np.mean, 0, self.as_array(('x', 'y')))
+        if len(self) == 0:
+            return None
+        val = np.array((self._column('x').mean(), self._column('y').mean()))
         if np.any(np.isnan(val)):
             val = None
         return val
-        
+
     def median(self):
-        val = np.apply_along_axis(np.median, 0, self.as_array(('x', 'y')))
+        if len(self) == 0:
+            return None
+        val = np.array(
+            (np.median(self._column('x')), np.median(self._column('y'))))
         if np.any(np.isnan(val)):
             val = None
         return val
 
     @property
     def total_duration(self):
-        return sum((p.duration for p in self.points))
+        if self._total_duration is None:
+            # Plain Python numbers, like sum() over the points would give --
+            # including 0, not 0.0, for no points.
+            self._total_duration = 0
+            if len(self) > 0:
+                self._total_duration = self._arrays['duration'].sum().item()
+        return self._total_duration
+
+    @property
+    def start_ms(self):
+        """ The time of the first point, or None if there are no points """
+        if len(self) == 0:
+            return None
+        return self._column('time')[0].item()
+
+    @property
+    def end_ms(self):
+        """ When the last point ends (its time plus its duration), or None """
+        if len(self) == 0:
+            return None
+        return (self._column('time')[-1] + self._column('duration')[-1]).item()
 
     def recenter_by(self, x, y):
-        points = copy.deepcopy(self.points)
-        for point in points:
-            point.x += x
-            point.y += y
-        return Scanpath(points=points)
+        arrays = dict(self._arrays)
+        arrays['x'] = arrays['x'] + x
+        arrays['y'] = arrays['y'] + y
+        return self._with_arrays(arrays)
 
     def constrain_to(self,
         min_x_const = (0,0),
         min_y_const = (0,0),
         max_x_const = (1000,1000),
         max_y_const = (1000,1000)):
-        plist = copy.deepcopy(self)
-        for p in plist:
-            if p.x < min_x_const[0]: p.x = min_x_const[1]
-            if p.x > max_x_const[0]: p.x = max_x_const[1]
-            if p.y < min_y_const[0]: p.y = min_y_const[1]
-            if p.y > max_y_const[0]: p.y = max_y_const[1]
-        return plist
+        arrays = dict(self._arrays)
+        x, y = arrays['x'], arrays['y']
+        x = np.where(x < min_x_const[0], min_x_const[1], x)
+        x = np.where(x > max_x_const[0], max_x_const[1], x)
+        y = np.where(y < min_y_const[0], min_y_const[1], y)
+        y = np.where(y > max_y_const[0], max_y_const[1], y)
+        arrays['x'], arrays['y'] = x, y
+        sp = self._with_arrays(arrays)
+        sp.headers = copy.deepcopy(self.headers)
+        return sp
+
+    def shape_mask(self, shape):
+        """ Return a boolean array, True for points inside shape. """
+        x, y = self._column('x'), self._column('y')
+        if hasattr(shape, 'contains_points'):
+            return shape.contains_points(x, y)
+        return np.array(
+            [xy in shape for xy in zip(x.tolist(), y.tolist())], dtype=bool)
 
     def points_within(self, shape):
-        plist = copy.deepcopy(self.points)
-        return Scanpath(points=[p for p in plist if (p.x, p.y) in shape])
+        if shape is None:
+            return self[:]
+        return self._masked(self.shape_mask(shape))
 
     def as_array(self,
             measures=None,
-            dtype=np.float32):
-        """ Turns our list of points into a numpy ndarray. """
-        # Map the desired properties into a list
-        # for every point in our path.
+            dtype=None):
+        """
+        Turns our point data into a 2D numpy ndarray. Unless dtype is given,
+        the array gets the smallest dtype that holds all of measures -- so
+        integer data stays integer.
+        """
+        # Our data is already in columns; just copy them into place.
         if measures is None: measures = self.measures
-        return np.array([
-            [getattr(point, m) for m in measures]
-                for point in self.points], dtype=dtype)
+        if dtype is None:
+            dtype = np.result_type(*[self._arrays[m] for m in measures])
+        arr = np.empty((len(self), len(measures)), dtype=dtype)
+        for i, m in enumerate(measures):
+            arr[:,i] = self._arrays[m]
+        return arr
 
 
+    def as_columns(self, measures=None):
+        """
+        Return a dict of measure name to 1D array, each in its own dtype.
+        These are our own (read-only) arrays, not copies.
+        """
+        if measures is None: measures = self.measures
+        return dict((m, self._arrays[m]) for m in measures)
+
     def time_index(self, time):
-        t1 = self.points[0].time
-        for i in xrange(len(self.points)):
-            t2 = self.points[i].time
-            if (t1 <= time and t2 > time):
-                return i - 1
-            t1 = t2
-        return len(self.points)  # It's the last point!
+        """
+        Return the index of the last point starting at or before time.
+        Times outside our points' times return len(self).
+        """
+        # Points are in time order, so a binary search does the job.
+        i = np.searchsorted(self._arrays['time'], time, side='right')
+        if i == 0 or i == len(self):
+            return len(self)  # It's the last point!
+        return int(i - 1)
 
 
 class UniformelySampledScanpath(Scanpath):
     uniformely_sampled = True
 
-    def __init__(self, samples_per_second, points, measures, headers={}):
+    def __init__(self, samples_per_second, points, measures, headers=None):
         super(UniformelySampledScanpath, self).__init__(headers=headers)
         self.samples_per_second = samples_per_second
         self.points = points
         self.measures = measures
-        self.headers = headers
         self.time_measures = ('time', 'duration')
+
+    # Our points are already a 2D array; store them as-is.
+    @property
+    def points(self):
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        self._points = points
     
     def as_array(self, measures=None):
         if measures is None:
@@ -196,6 +417,9 @@ class UniformelySampledScanpath(Scanpath):
     
     def measure_index(self, name):
         return self.measures.index(name)
+
+    def _column(self, name):
+        return self.points[:,self.measure_index(name)]
     
     def measure_indexes(self, names):
         return [self.measures.index(n) for n in names]
@@ -223,10 +447,18 @@ class UniformelySampledScanpath(Scanpath):
         for i in indexes_to_copy:
             to_pt[i] = from_pt[i]
 
+    def hold_measures(self, from_index, start, end):
+        """
+        Copy the interpolable measures of the point at from_index over
+        points[start:end], in place -- one assignment for the whole run.
+        """
+        indexes = self.measure_indexes(self.interpolable_measures)
+        self.points[start:end, indexes] = self.points[from_index, indexes]
+
     def recenter_by(self, x, y):
-        out = copy.deepcopy(self)
-        indexes = self.measure_indexes(('x', 'y'))
-        out.points[:,[indexes]] += [x,y]
+        out = copy.copy(self)
+        out.points = self.points.copy()
+        out.points[:,self.measure_indexes(('x', 'y'))] += [x, y]
         return out
 
     def constrain_to(self,
@@ -235,7 +467,8 @@ class UniformelySampledScanpath(Scanpath):
         max_x_const = (1000,1000),
         max_y_const = (1000,1000)):
         
-        out = copy.deepcopy(self)
+        out = copy.copy(self)
+        out.points = self.points.copy()
         x_i = self.measure_index('x')
         y_i = self.measure_index('y')
         ar = out.points
@@ -246,24 +479,18 @@ class UniformelySampledScanpath(Scanpath):
         return out
 
 
-    def points_matching(self, fx, measures=('x', 'y')):
+    def _masked(self, mask):
         sc = copy.copy(self)
-        p_arr = self.as_array(measures)
-        matches = self.points[np.apply_along_axis(fx, 1, p_arr)]
-        sc.points = matches
+        sc.points = self.points[mask]
         return sc
 
-    def points_within(self, shape):
-        sc = copy.copy(self)
-        def in_fx(p):
-            return p in shape
-        if shape is not None:
-            sc = self.points_matching(in_fx, ('x', 'y'))
-        return sc
+    def points_matching(self, fx, measures=('x', 'y')):
+        p_arr = self.as_array(measures)
+        return self._masked(np.apply_along_axis(fx, 1, p_arr))
 
 class IViewScanpath(UniformelySampledScanpath):
 
-    def __init__(self, samples_per_second, points, measures, headers={}):
+    def __init__(self, samples_per_second, points, measures, headers=None):
         super(IViewScanpath, self).__init__(samples_per_second, points, 
             measures, headers)
 
@@ -273,9 +500,9 @@ class IViewScanpath(UniformelySampledScanpath):
 class IView3Scanpath(IViewScanpath):
 
     def __init__(self, samples_per_second, points, measures, 
-                headers={}):
-        super(IView3Scanpath, self).__init__(samples_per_second, points, measures)
-        self.headers = headers
+                headers=None):
+        super(IView3Scanpath, self).__init__(samples_per_second, points,
+            measures, headers)
         self.time_measures = ('time', 'timestamp', 'duration')
 
     def correct_times(self):
@@ -308,20 +535,23 @@ class PointFactory(object):
         component_list.
         """
 
+        # Work out which columns we're keeping once, not once per point
+        columns = tuple(
+            (i, attr_name, attr_type)
+            for i, (attr_name, attr_type) in enumerate(attribute_list)
+            if attr_type is not None)
+
         points = []
         for point_data in components:
             point = self.type_to_produce()
 
             try:
-                for i in range(len(attribute_list)):
-                    attr_name = attribute_list[i][0]
-                    attr_type = attribute_list[i][1]
-                    if attr_type is not None:
-                        try:
-                            setattr(point, attr_name, attr_type(point_data[i]))
-                        except AttributeError:
-                            err_str = "Could not set %s" % attribute_list
-                            raise AttributeError(err_str)
+                for i, attr_name, attr_type in columns:
+                    try:
+                        setattr(point, attr_name, attr_type(point_data[i]))
+                    except AttributeError:
+                        err_str = "Could not set %s" % attribute_list
+                        raise AttributeError(err_str)
             except ValueError:
                 err_str = ("Could not parse %s with %s" %
                     (point_data, attribute_list))
@@ -330,6 +560,25 @@ class PointFactory(object):
             points.append(point)
         return points
 
+    def _numeric_columns(self, components, indexes):
+        """
+        Return a 2D float array of the columns at indexes in components.
+        Converts the whole table at once, falling back to going line by
+        line if the lines aren't all the same length.
+        """
+        rows = np.array(list(components))
+        try:
+            columns = rows[:,indexes]
+        except IndexError:
+            return np.array([
+                [float(line[i]) for i in indexes]
+            for line in rows], dtype=float)
+        try:
+            return columns.astype(float)
+        except ValueError:
+            err_str = ("Could not parse columns %s as numbers" % indexes)
+            raise ValueError(err_str)
+
 
 class IView2PointFactory(PointFactory):
     """
@@ -354,10 +603,7 @@ class IView2PointFactory(PointFactory):
     def from_component_list(self, components):
         indexes_to_extract = [
             i for i in range(len(self.data_map)) if self.data_map[i][1] == int]
-        return np.array([
-                [line[i] for i in indexes_to_extract]
-            for line in components], dtype=float
-        )
+        return self._numeric_columns(components, indexes_to_extract)
     
     @property
     def numeric_measures(self):
@@ -380,11 +626,7 @@ class IView3PointFactory(PointFactory):
 
     def from_component_list(self, components):
         indexes = [p[0] for p in self.measure_map.values()]
-        return np.array(
-            [
-                [float(line[i]) for i in  indexes]
-            for line in components], dtype=float
-        )
+        return self._numeric_columns(components, indexes)
     
     @property
     def numeric_measures(self):
@@ -394,10 +636,13 @@ class IView3PointFactory(PointFactory):
 
 class IViewFixationFactory(PointFactory):
     """
-    Maps a list of fixations into a list of Points.
+    Maps a list of fixations into a list of IViewFixations.
     """
 
-    def __init__(self, type_to_produce=Point):
+    # array.array typecodes for the numeric columns in data_map
+    ARRAY_TYPECODES = {int: 'l', float: 'd'}
+
+    def __init__(self, type_to_produce=IViewFixation):
         super(IViewFixationFactory, self).__init__(type_to_produce)
         self.data_map = [
             ('start_num', int),
@@ -412,3 +657,32 @@ class IViewFixationFactory(PointFactory):
     def from_component_list(self, components):
         return super(IViewFixationFactory, self).from_component_list(
             components, self.data_map)
+
+    def columns_from_component_list(self, components):
+        """
+        Return a dict mapping each attribute in data_map to an array of
+        its values, converting a whole column at a time instead of
+        building IViewFixations. Raises ValueError if any line is too short
+        or holds a value that won't parse or won't fit the column's type.
+        """
+        rows = list(components)
+        if len(rows) == 0 or min(map(len, rows)) < len(self.data_map):
+            raise ValueError("Fixation lines must have at least %s columns" %
+                len(self.data_map))
+        # zip(*rows) transposes in C; map then converts a column per call,
+        # straight into a typed buffer.
+        cols = zip(*rows)
+        arrays = {}
+        for i, (attr_name, attr_type) in enumerate(self.data_map):
+            typecode = self.ARRAY_TYPECODES.get(attr_type)
+            if typecode is None:
+                arrays[attr_name] = np.array(cols[i])
+                continue
+            try:
+                values = array.array(typecode, map(attr_type, cols[i]))
+            except OverflowError, e:
+                # int() is happy to make a long; a C long isn't
+                raise ValueError("Could not fit %s into an array: %s" %
+                    (attr_name, e))
+            arrays[attr_name] = np.frombuffer(values, dtype=typecode)
+        return arrays
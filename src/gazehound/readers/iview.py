@@ -191,6 +191,9 @@ class IView3ScanpathReader(IViewReader):
 
 class IViewFixationReader(IViewReader):
 
+    # Builds the fixations; swap in a subclass to change how they're parsed
+    fixation_factory = gazepoint.IViewFixationFactory
+
     def __init__(self,
         file_data=None, skip_comments=True, comment_char="#",
         opts_for_parser={}, filename=None):
@@ -218,7 +221,15 @@ class IViewFixationReader(IViewReader):
             'Maximal Pixel': ('maximal_pixel', int)}
 
     def scanpath(self):
-        """Return a list of Points representing the scan path."""
-        fact = gazepoint.IViewFixationFactory()
-        points = fact.from_component_list(self)
-        return gazepoint.Scanpath(points = points)
\ No newline at end of file
+        """Return a Scanpath of IViewFixations representing the scan path."""
+        fact = self.fixation_factory()
+        rows = list(self)
+        try:
+            return gazepoint.Scanpath(
+                arrays = fact.columns_from_component_list(rows),
+                point_type = gazepoint.IViewFixation)
+        except ValueError:
+            # Ragged or otherwise odd file -- go point by point, which will
+            # complain about the line that's actually wrong.
+            points = fact.from_component_list(rows)
+            return gazepoint.Scanpath(points = points)
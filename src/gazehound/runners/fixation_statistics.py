@@ -8,7 +8,8 @@
 
 import sys
 import os.path
-import math
+import copy
+import numpy as np
 from optparse import OptionParser
 from gazehound import readers, timeline, viewing, shapes
 from gazehound.writers import delimited
@@ -131,44 +132,14 @@ class FixationStatisticsAnalyzer(object):
         self.scanpath = scanpath
         self.timeline = timeline
 
-        # TODO: Don't hardcode these.
-        MAX_X = 800
-        MAX_Y = 600
-
-        def default_valid(x_width, y_width, slop_frac, point):
-            xslop = x_width*slop_frac
-            yslop = y_width*slop_frac
-            max_x = x_width+xslop
-            min_x = 0-xslop
-            max_y = y_width+yslop
-            min_y = 0-yslop
-
-            return ((point.x >= min_x and point.x < max_x) and
-            (point.y >= min_y and point.y < max_y) and not
-            (point.x == 0 and point.y == 0))
-
-        def svf(point):
-            return default_valid(MAX_X, MAX_Y, 0, point)
-
-        def lvf(point):
-            return default_valid(MAX_X, MAX_Y, .1, point)
-
-        self.strict_valid_fun = svf
-        self.lax_valid_fun = lvf
-
-        def in_fun(shape, point):
-            return (point.x, point.y) in shape
-
-        self.in_fun = in_fun
-
     def general_stats(self):
         """Return a FixationStats containing basic data about the scanpath"""
 
         data = FixationStats(
             presented='screen',
             area='all',
-            start_ms=self.scanpath[0].time,
-            end_ms=self.scanpath[-1].time+self.scanpath[-1].duration,
+            start_ms=self.scanpath.start_ms,
+            end_ms=self.scanpath.end_ms,
             total_fixations=len(self.scanpath),
             time_fixating=self.__time_fixating(self.scanpath),
             fixations_per_second=self.__fixations_per_second(self.scanpath),
@@ -189,81 +160,72 @@ class FixationStatisticsAnalyzer(object):
         data = []
         doshapes = hasattr(self.timeline, 'has_shapes')
         for pres in self.timeline:
-            if len(pres.scanpath) == 0:
-                stats = FixationStats(
-                    presented=pres.name,
-                    area='all')
-            else:
-                stats = FixationStats(
-                    presented=pres.name,
-                    area='all',
-                    start_ms=pres.scanpath[0].time,
-                    end_ms=pres.scanpath[-1].time+pres.scanpath[-1].duration,
-                    total_fixations=len(pres.scanpath),
-                    time_fixating=self.__time_fixating(pres.scanpath),
-                    fixations_per_second=self.__fixations_per_second(
-                        pres.scanpath),
-                    distance_between_fixations=self.__distance_between_fixations(
-                        pres.scanpath))
-
-                stats.time_in = stats.time_fixating
-                stats.time_out = ((stats.end_ms - stats.start_ms) -
-                                    stats.time_fixating)
+            stats = self.__presentation_stats(pres)
             data.append(stats)
             if doshapes:
-                for ss in self.shape_stats(pres):
-                    data.append(ss)
-                    pass
+                data.extend(self.shape_stats(pres, stats))
         return data
 
-    def shape_stats(self, pres):
+    def shape_stats(self, pres, pres_stats=None):
+        """
+        Return a list of FixationStats, one for each shape in pres.
+        pres_stats is pres's 'all' stats; only time_in and time_out depend
+        on the shape, so everything else gets copied from it.
+        """
         stats_list = []
         if pres.shapes is None:
             return[FixationStats(
                 presented=pres.name,
                 area="Can't read shape file")]
+        if pres_stats is None:
+            pres_stats = self.__presentation_stats(pres)
+        durations = pres.scanpath.as_columns(('duration',))['duration']
         for s in pres.shapes:
-            if len(pres.scanpath) == 0:
-                stats = FixationStats(
-                    presented=pres.name,
-                    area=s.name)
-            else:
-                stats = FixationStats(
-                    presented=pres.name,
-                    area=s.name,
-                    start_ms=pres.scanpath[0].time,
-                    end_ms=pres.scanpath[-1].time+pres.scanpath[-1].duration,
-                    total_fixations=len(pres.scanpath),
-                    time_fixating=self.__time_fixating(pres.scanpath),
-                    fixations_per_second=self.__fixations_per_second(
-                        pres.scanpath),
-                    distance_between_fixations=self.__distance_between_fixations(
-                        pres.scanpath))
-
-                def f(point):
-                    return self.in_fun(s, point)
-
-                stats.time_in = sum(p.duration
-                                    for p in pres.scanpath.valid_points(f))
+            stats = copy.copy(pres_stats)
+            stats.area = s.name
+            if len(pres.scanpath) > 0:
+                stats.time_in = durations[
+                    pres.scanpath.shape_mask(s)].sum().item()
                 stats.time_out =(stats.end_ms - stats.start_ms) - stats.time_in
             stats_list.append(stats)
 
         return stats_list
 
+    def __presentation_stats(self, pres):
+        """The 'all' FixationStats for a single presentation"""
+        if len(pres.scanpath) == 0:
+            return FixationStats(
+                presented=pres.name,
+                area='all')
+        stats = FixationStats(
+            presented=pres.name,
+            area='all',
+            start_ms=pres.scanpath.start_ms,
+            end_ms=pres.scanpath.end_ms,
+            total_fixations=len(pres.scanpath),
+            time_fixating=self.__time_fixating(pres.scanpath),
+            fixations_per_second=self.__fixations_per_second(
+                pres.scanpath),
+            distance_between_fixations=self.__distance_between_fixations(
+                pres.scanpath))
+
+        stats.time_in = stats.time_fixating
+        stats.time_out = ((stats.end_ms - stats.start_ms) -
+                            stats.time_fixating)
+        return stats
+
     def __total_fixations(self, scanpath):
         """The total number of fixations in a point path"""
         return len(scanpath)
 
     def __time_fixating(self, scanpath):
         """Time spent fixating during a point path"""
-        return sum(p.duration for p in scanpath)
+        return scanpath.total_duration
 
     def __pp_duration(self, scanpath):
         if len(scanpath) == 0:
             return 0
-        start = scanpath[0].time
-        end = scanpath[-1].time+scanpath[-1].duration
-        return end-start
+        return scanpath.end_ms - scanpath.start_ms
 
     def __fixations_per_second(self, scanpath):
         """ Number of fixations divided by seconds fixating """
@@ -278,13 +240,11 @@ class FixationStatisticsAnalyzer(object):
         if len(scanpath) < 2:
             return 0
 
-        def dist(p1, p2):
-            return math.sqrt((p1.x-p2.x)**2 + (p1.y-p2.y)**2)
-
-        dsum = 0
-        for i in range(1, len(scanpath)):
-            dsum += dist(scanpath[i-1], scanpath[i])
-        return float(dsum) / (len(scanpath)-1)
+        x, y = scanpath.as_array(('x', 'y')).T
+        dists = np.sqrt(np.diff(x)**2 + np.diff(y)**2)
+        # Add up in order, as plain floats, so the mean doesn't drift in
+        # the last digits from what a loop over the points would give.
+        return sum(dists.tolist()) / (len(scanpath)-1)
 
 
 class FixationStats(object):
@@ -140,21 +140,9 @@ class GazeStatisticsAnalyzer(object):
         SLOP_FRAC = 0.1
         X_SLOP = MAX_X*SLOP_FRAC
         Y_SLOP = MAX_Y*SLOP_FRAC
-        strict_rect = shapes.Rectangle(0, 0, MAX_X, MAX_Y)
-        lax_rect = shapes.Rectangle(
-            -X_SLOP, -Y_SLOP, MAX_X+X_SLOP, MAX_Y+Y_SLOP)
-        
-        def default_valid(shape, point):
-            return (point in shape) and (tuple(point) <> (0,0))
-
-        def svf(point):
-            return default_valid(strict_rect, point)
-
-        def lvf(point):
-            return default_valid(lax_rect, point)
-            
-        self.strict_valid_fun = svf
-        self.lax_valid_fun = lvf
+        # (x1, y1, x2, y2), for Scanpath.within_bounds_mask()
+        self.strict_bounds = (0, 0, MAX_X, MAX_Y)
+        self.lax_bounds = (-X_SLOP, -Y_SLOP, MAX_X+X_SLOP, MAX_Y+Y_SLOP)
                         
     def general_stats(self):
         """Return a GazeStats containing basic data about the scanpath"""
@@ -165,12 +153,9 @@ class GazeStatisticsAnalyzer(object):
             total_points = len(self.scanpath),
             start_ms = self.scanpath[0][time_idx],
             end_ms = self.scanpath[-1][time_idx],
-            valid_strict = len(self.scanpath.points_matching(
-                self.strict_valid_fun
-            )),
-            valid_lax = len(self.scanpath.points_matching(
-                self.lax_valid_fun
-            ))
+            valid_strict = self.__valid_count(
+                self.scanpath, self.strict_bounds),
+            valid_lax = self.__valid_count(self.scanpath, self.lax_bounds)
         )
         
         data.points_in = data.valid_strict
@@ -193,29 +178,36 @@ class GazeStatisticsAnalyzer(object):
                 total_points = len(pres.scanpath),
                 start_ms = pres.start,
                 end_ms = pres.end,
-                valid_strict = len(pres.scanpath.points_matching(
-                    self.strict_valid_fun
-                )),
-                valid_lax = len(pres.scanpath.points_matching(
-                    self.lax_valid_fun
-                ))
+                valid_strict = self.__valid_count(
+                    pres.scanpath, self.strict_bounds),
+                valid_lax = self.__valid_count(
+                    pres.scanpath, self.lax_bounds)
             )
             stats.points_in = stats.valid_strict
             stats.points_out = stats.total_points - stats.valid_strict
             data.append(stats)
             if doshapes:
-                for ss in self.shape_stats(pres):
-                    data.append(ss)
-                    pass
+                data.extend(self.shape_stats(
+                    pres, stats.valid_strict, stats.valid_lax))
         return data
     
-    def shape_stats(self, pres):
+    def shape_stats(self, pres, valid_strict = None, valid_lax = None):
+        """
+        Return a list of GazeStats, one for each shape in pres. The validity
+        counts don't depend on the shape; pass them in if you've already
+        got them for pres.
+        """
         stats_list = []
         if pres.shapes is None:
             return[GazeStats(
                 presented = pres.name, 
                 area = "Can't read shape file")
             ]
+        if valid_strict is None:
+            valid_strict = self.__valid_count(
+                pres.scanpath, self.strict_bounds)
+        if valid_lax is None:
+            valid_lax = self.__valid_count(pres.scanpath, self.lax_bounds)
         for s in pres.shapes:
             stats = GazeStats(
                 presented = pres.name,
@@ -223,20 +215,21 @@ class GazeStatisticsAnalyzer(object):
                 total_points = len(pres.scanpath),
                 start_ms = pres.start,
                 end_ms = pres.end,
-                valid_strict = len(pres.scanpath.points_matching(
-                    self.strict_valid_fun
-                )),
-                valid_lax = len(pres.scanpath.points_matching(
-                    self.lax_valid_fun
-                ))
+                valid_strict = valid_strict,
+                valid_lax = valid_lax
             )
                             
-            stats.points_in = len(pres.scanpath.points_within(s))
+            stats.points_in = int(pres.scanpath.shape_mask(s).sum())
             stats.points_out = stats.total_points - stats.points_in
             stats_list.append(stats)
             
         return stats_list
 
+    def __valid_count(self, scanpath, bounds):
+        """ Number of points in bounds that aren't at (0, 0) """
+        return int(scanpath.within_bounds_mask(
+            bounds, exclude_zero=True).sum())
+
 class GazeStats(object):
     """A data structure containing stats about a scanpath"""
     def __init__(self, 
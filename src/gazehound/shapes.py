@@ -10,6 +10,7 @@ import os.path
 import copy
 import array
 from ConfigParser import SafeConfigParser
+import numpy as np
 
 
 class Shape(object):
@@ -24,6 +25,15 @@ class Shape(object):
         raise NotImplementedError(
             "__contains__ must be overridden by subclass")
 
+    def contains_points(self, xs, ys):
+        """
+        Return a boolean array, True where the point (xs[i], ys[i]) lies
+        inside this shape. Subclasses should override this with something
+        faster.
+        """
+        return np.array(
+            [(x, y) in self for x, y in zip(xs, ys)], dtype=bool)
+
 
 class Rectangle(Shape):
 
@@ -46,6 +56,12 @@ class Rectangle(Shape):
             (x >= self.x1 and x <= self.x2) and
             (y >= self.y1 and y <= self.y2))
 
+    def contains_points(self, xs, ys):
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        return (
+            (xs >= self.x1) & (xs <= self.x2) &
+            (ys >= self.y1) & (ys <= self.y2))
+
     def to_matrix(self, type_str='f', fill_value=1.0, bkg_value=0.0):
         """
         Return a list of array.array objects, sized with this rectangle's
@@ -92,6 +108,13 @@ class Ellipse(Shape):
         (y - self.cy)**2/float(self.semiy**2))
         <= 1)
 
+    def contains_points(self, xs, ys):
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        return (
+        ((xs - self.cx)**2/float(self.semix**2) +
+        (ys - self.cy)**2/float(self.semiy**2))
+        <= 1)
+
     def height(self):
         return self.semiy*2
 
@@ -39,11 +39,6 @@ class Combiner(object):
         """ General case: extract viewings for nonuniform paths """
         t2 = copy.copy(self.timeline)
         for pres in t2:
-            sp = copy.copy(self.scanpath)
-            points = [p for p in self.scanpath
-                if (p.time_midpoint() >= pres.start
-                    and p.time_midpoint() < pres.end)]
-            sp.points = points
-            pres.scanpath = sp
+            pres.scanpath = self.scanpath.during(pres.start, pres.end)
         return timeline.Timeline(t2)
         
\ No newline at end of file
@@ -133,3 +133,14 @@ class TestDenoiseFilter(object):
         t_idx = self.points.measure_index('time')
         eq_(self.points[0][t_idx], self.filtered[0][t_idx])
         eq_(self.points[2][t_idx], self.filtered[2][t_idx])
+
+    def test_denoise_interpolates_linearly(self):
+        x_idx = self.points.measure_index('x')
+        eq_(359, self.filtered[2][x_idx])
+        eq_(362, int(round(self.filtered[4][x_idx])))
+        eq_(359.666, int(self.filtered[5][x_idx]*1000)/1000.0)
+
+    def test_denoise_skips_long_gaps(self):
+        x_idx = self.points.measure_index('x')
+        for i in range(7, 10):
+            eq_(0, self.filtered[i][x_idx])
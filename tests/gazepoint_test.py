@@ -111,6 +111,18 @@ class TestIView2PointFactory(object):
         points = self.iview_fact.from_component_list(self.point_ary)
         assert isinstance(points, np.ndarray)
 
+    def test_get_components_extracts_numeric_columns(self):
+        points = self.iview_fact.from_component_list(self.point_ary)
+        eq_(len(self.iview_fact.numeric_measures), points.shape[1])
+        eq_([0, 5034, 3490, 4687, 3380, 358, 577, 2400, 2080],
+            points[0].tolist())
+
+    @raises(ValueError)
+    def test_get_components_complains_about_bad_numbers(self):
+        bad = [list(line) for line in self.point_ary]
+        bad[1][6] = 'bogus'
+        self.iview_fact.from_component_list(bad)
+
 
 class TestFixationFactory(object):
     def setup(self):
@@ -125,12 +137,33 @@ class TestFixationFactory(object):
         fixations = self.fix_fact.from_component_list(self.fix_ary)
         scanpath = gazepoint.Scanpath(fixations)
         eq_(len(fixations), len(scanpath))
+
+    def test_columns_match_fixations(self):
+        fixations = self.fix_fact.from_component_list(self.fix_ary)
+        columns = self.fix_fact.columns_from_component_list(self.fix_ary)
+        eq_([f.end_time for f in fixations], columns['end_time'].tolist())
+        eq_([f.object for f in fixations], columns['object'].tolist())
+
+    def test_numeric_columns_are_int_arrays(self):
+        columns = self.fix_fact.columns_from_component_list(self.fix_ary)
+        eq_(np.int_, columns['time'].dtype)
+        eq_(len(self.fix_ary), len(columns['time']))
+
+    @raises(ValueError)
+    def test_columns_reject_ragged_lines(self):
+        self.fix_fact.columns_from_component_list(
+            [line[:4] for line in self.fix_ary])
         
     def test_components_have_proper_properties(self):
         fixations = self.fix_fact.from_component_list(self.fix_ary)
         for fix in fixations:
             for mapping in self.fix_fact.data_map:
                 eq_(type(getattr(fix, mapping[0])), mapping[1])
+
+    def test_components_are_fixations(self):
+        fixations = self.fix_fact.from_component_list(self.fix_ary)
+        assert isinstance(fixations[0], gazepoint.IViewFixation)
+
     # and a spot test...
     def test_one_value(self):
         fixations = self.fix_fact.from_component_list(self.fix_ary)
@@ -207,10 +240,136 @@ class TestScanpath(object):
         def criterion(point):
             return (point.x > 0 and point.x < 800)
     
+    def test_empty_scanpaths_do_not_share_headers(self):
+        sp1 = gazepoint.Scanpath()
+        sp1.headers['sample_rate'] = 60
+        eq_({}, gazepoint.Scanpath().headers)
+
+    def test_scanpath_builds_from_arrays(self):
+        scanpath = gazepoint.Scanpath(arrays={
+            'x': [10, 20], 'y': [30, 40],
+            'time': [0, 17], 'duration': [17, 17]})
+        eq_(2, len(scanpath))
+        eq_((20, 40, 17), (scanpath[1].x, scanpath[1].y, scanpath[1].time))
+        eq_(34, scanpath.total_duration)
+
+    def test_scanpath_knows_start_and_end(self):
+        scanpath = gazepoint.Scanpath(arrays={
+            'x': [10, 20], 'y': [30, 40],
+            'time': [5, 17], 'duration': [12, 10]})
+        eq_(5, scanpath.start_ms)
+        eq_(27, scanpath.end_ms)
+        eq_(None, gazepoint.Scanpath().start_ms)
+        eq_(None, gazepoint.Scanpath().end_ms)
+
+    def test_during_selects_by_time_midpoint(self):
+        scanpath = gazepoint.Scanpath(headers={'subject': '001'}, arrays={
+            'x': [10, 20, 30], 'y': [30, 40, 50],
+            'time': [0, 10, 20], 'duration': [10, 10, 5]})
+        eq_([5, 15, 22], scanpath.time_midpoints().tolist())
+        during = scanpath.during(5, 22)
+        eq_([10, 20], [p.x for p in during])
+        eq_('001', during.headers['subject'])
+
+    def test_constrain_keeps_headers(self):
+        scanpath = gazepoint.Scanpath(points = self.points,
+            headers = {'subject': '001'})
+        constrained = scanpath.constrain_to()
+        eq_({'subject': '001'}, constrained.headers)
+        constrained.headers['subject'] = '002'
+        eq_('001', scanpath.headers['subject'])
+
+    def test_scanpath_keeps_point_types_and_attributes(self):
+        fixations = gazepoint.IViewFixationFactory().from_component_list(
+            mock_objects.smi_fixation_ary())
+        scanpath = gazepoint.Scanpath(points = fixations)
+        eq_(type(fixations[0]), type(scanpath[0]))
+        eq_(fixations[-1].end_time, scanpath[-1].end_time)
+        eq_(fixations[0].object, scanpath[0].object)
+
+    def test_scanpath_returns_valid_points_with_mask(self):
+        scanpath = gazepoint.Scanpath(points = self.points)
+        valid = scanpath.valid_points(np.array([True, False]*3))
+        eq_(3, len(valid))
+        eq_(33, valid[1].time)
+
+    def test_within_bounds_mask_matches_point_within(self):
+        scanpath = gazepoint.Scanpath(points = self.points)
+        bounds = (353, 473, 365, 543)
+        eq_([p.within(bounds) for p in scanpath],
+            scanpath.within_bounds_mask(bounds).tolist())
+
     def test_scanpath_computes_total_length(self):
         scanpath = gazepoint.Scanpath(points = self.points)
         eq_(float(len(self.points)), scanpath.total_duration)
     
+    def test_total_duration_updates_after_extend(self):
+        scanpath = gazepoint.Scanpath(points = self.points)
+        eq_(6, scanpath.total_duration)
+        scanpath.extend(gazepoint.Scanpath(points = self.points))
+        eq_(12, scanpath.total_duration)
+
+    def test_arrays_are_copied_in(self):
+        durations = np.array([1, 2, 3])
+        scanpath = gazepoint.Scanpath(arrays={
+            'x': [1, 2, 3], 'y': [1, 2, 3],
+            'time': [0, 1, 3], 'duration': durations})
+        eq_(6, scanpath.total_duration)
+        durations[:] = 10
+        eq_(6, scanpath.total_duration)
+        eq_(1, scanpath[0].duration)
+
+    @raises(ValueError)
+    def test_columns_are_read_only(self):
+        scanpath = gazepoint.Scanpath(points = self.points)
+        scanpath[1:].as_columns()['duration'][:] = 10
+
+    def test_total_duration_is_a_python_number(self):
+        scanpath = gazepoint.Scanpath(arrays={
+            'x': [10, 20], 'y': [30, 40],
+            'time': [0, 17], 'duration': [17, 17]})
+        eq_(int, type(scanpath.total_duration))
+        eq_(int, type(gazepoint.Scanpath().total_duration))
+
+    def test_empty_scanpath_extends_with_fixations(self):
+        fixations = gazepoint.Scanpath(points = 
+            gazepoint.IViewFixationFactory().from_component_list(
+                mock_objects.smi_fixation_ary()))
+        scanpath = gazepoint.Scanpath()
+        scanpath.extend(fixations)
+        eq_(len(fixations), len(scanpath))
+        eq_(gazepoint.IViewFixation, type(scanpath[0]))
+        eq_(fixations[-1].end_time, scanpath[-1].end_time)
+        eq_(fixations[0].object, scanpath[0].object)
+        eq_(fixations.as_array().dtype, scanpath.as_array().dtype)
+
+    def test_mixed_points_keep_first_points_attributes(self):
+        scanpath = gazepoint.Scanpath(points = [
+            gazepoint.Point(1, 2, 0, 1), gazepoint.IViewPoint(3, 4, 1, 1)])
+        eq_(gazepoint.Point, type(scanpath[1]))
+        eq_((3, 4), (scanpath[1].x, scanpath[1].y))
+
+    @raises(ValueError)
+    def test_mixed_points_need_first_points_attributes(self):
+        gazepoint.Scanpath(points = [
+            gazepoint.IViewPoint(1, 2, 0, 1), gazepoint.Point(3, 4, 1, 1)])
+
+    def test_extending_with_empty_scanpath_does_nothing(self):
+        fixations = gazepoint.Scanpath(points = 
+            gazepoint.IViewFixationFactory().from_component_list(
+                mock_objects.smi_fixation_ary()))
+        before = fixations.as_array().tolist()
+        fixations.extend(gazepoint.Scanpath())
+        eq_(before, fixations.as_array().tolist())
+        eq_(gazepoint.IViewFixation, type(fixations[0]))
+
+    @raises(ValueError)
+    def test_extend_rejects_mismatched_attributes(self):
+        fixations = gazepoint.Scanpath(points = 
+            gazepoint.IViewFixationFactory().from_component_list(
+                mock_objects.smi_fixation_ary()))
+        fixations.extend(gazepoint.Scanpath(points = self.points))
+
     def test_scanpath_computes_mean(self):
          scanpath = gazepoint.Scanpath(points = self.points)
          x, y = scanpath.mean()
@@ -264,6 +423,16 @@ class TestScanpath(object):
         filtered = scanpath.points_within(rect)
         assert len(filtered) < len(scanpath)
         
+    def test_shape_mask_matches_contains(self):
+        scanpath = gazepoint.Scanpath(points = self.points)
+        ellipse = shapes.Ellipse(360, 500, 10, 50)
+        eq_([(p.x, p.y) in ellipse for p in scanpath],
+            scanpath.shape_mask(ellipse).tolist())
+
+    def test_points_in_without_shape_keeps_all(self):
+        scanpath = gazepoint.Scanpath(points = self.points)
+        eq_(len(scanpath), len(scanpath.points_within(None)))
+
     def test_points_convert_to_numpy(self):
         scanpath = gazepoint.Scanpath(points = self.points)
         npath = scanpath.as_array()
@@ -276,6 +445,24 @@ class TestScanpath(object):
         npath = scanpath.as_array(props)
         eq_((len(scanpath), len(props)), npath.shape)
     
+    def test_points_convert_to_integers_when_possible(self):
+        scanpath = gazepoint.Scanpath(points = self.points)
+        assert np.issubdtype(scanpath.as_array(('x', 'y')).dtype, np.integer)
+        eq_(np.float32, scanpath.as_array(('x', 'y'), np.float32).dtype)
+
+    def test_points_convert_to_columns(self):
+        scanpath = gazepoint.Scanpath(points = self.points)
+        cols = scanpath.as_columns(('x', 'duration'))
+        eq_([358, 353, 357, 365, 58, 518], cols['x'].tolist())
+        assert np.issubdtype(cols['x'].dtype, np.integer)
+        assert np.issubdtype(cols['duration'].dtype, np.floating)
+
+    def test_points_convert_in_measure_order(self):
+        scanpath = gazepoint.Scanpath(points = self.points)
+        npath = scanpath.as_array(('y', 'time'))
+        eq_([543, 0], npath[0].tolist())
+        eq_([-56, 83], npath[-1].tolist())
+
     def test_time_index_finds_at_zero(self):
         pp = gazepoint.Scanpath(points = self.points)
         eq_(0, pp.time_index(0))
@@ -284,6 +471,10 @@ class TestScanpath(object):
         pp = gazepoint.Scanpath(points = self.points)
         eq_(2, pp.time_index(35))
     
+    def test_time_index_finds_at_point_start(self):
+        pp = gazepoint.Scanpath(points = self.points)
+        eq_(1, pp.time_index(16))
+
     def test_time_index_gets_last_point_for_large_t(self):
         pp = gazepoint.Scanpath(points = self.points)
         eq_(len(pp), pp.time_index(100000))
@@ -313,6 +504,21 @@ class TestIViewScanpath(object):
         neq_(0, len(filtered))
         gt_(len(self.path), len(filtered))
     
+    def test_within_bounds_mask_counts_rows(self):
+        mask = self.path.within_bounds_mask((0, 0, 800, 600), True)
+        eq_(len(self.path), len(mask))
+        eq_(7, mask.sum())
+
+    def test_hold_measures_copies_interpolable_measures(self):
+        before = self.path.as_array().copy()
+        self.path.hold_measures(1, 2, 5)
+        after = self.path.as_array()
+        interp = self.path.measure_indexes(self.path.interpolable_measures)
+        time_i = self.path.measure_index('time')
+        eq_([before[1, interp].tolist()]*3, after[2:5, interp].tolist())
+        eq_(before[:, time_i].tolist(), after[:, time_i].tolist())
+        eq_(before[5:].tolist(), after[5:].tolist())
+
     def test_constrain_works(self):
         pre_ar = self.path.as_array(('x')) < 400
         lt_(0, np.sum(pre_ar))
@@ -320,6 +526,13 @@ class TestIViewScanpath(object):
             (400, 400), (300,300), (800, 800), (600,600))
         ar = constrained.as_array(('x'))
         eq_(0, np.sum(ar < 400))
+
+    def test_constrain_leaves_original_alone(self):
+        before = self.path.as_array().copy()
+        constrained = self.path.constrain_to(
+            (400, 400), (300,300), (800, 800), (600,600))
+        eq_(before.tolist(), self.path.as_array().tolist())
+        eq_(self.path.measures, constrained.measures)
     
 class TestPoint(object):
     def __init__(self):
@@ -338,6 +551,9 @@ class TestPoint(object):
         assert self.hundreds.within(in_bounds)
         assert not self.hundreds.within(out_bounds)
     
+    def test_uses_slots(self):
+        assert not hasattr(self.hundreds, '__dict__')
+
     def test_time_midpoint(self):
         self.hundreds.time = 100
         self.hundreds.duration = 50
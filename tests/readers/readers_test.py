@@ -12,6 +12,7 @@ from os import path
 from gazehound.readers.delimited import DelimitedReader
 from gazehound.readers.iview import IView2ScanpathReader, IViewFixationReader
 from gazehound.readers.timeline import TimelineReader
+from gazehound import gazepoint
 from ..testutils import *
 from nose.tools import *
 
@@ -144,6 +145,20 @@ class TestIView2ScanpathReader(object):
         eq_(scanpath.headers['file_version'], '2')
 
 
+class RecordingFixationFactory(gazepoint.IViewFixationFactory):
+    """Notes every time the point-by-point parser gets used"""
+    slow_path_calls = []
+
+    def from_component_list(self, components):
+        RecordingFixationFactory.slow_path_calls.append(components)
+        return super(RecordingFixationFactory, self).from_component_list(
+            components)
+
+
+class RecordingFixationReader(IViewFixationReader):
+    fixation_factory = RecordingFixationFactory
+
+
 class TestIViewFixationReader(object):
     """Exercise the IViewFixationReader"""
     def __init__(self):
@@ -153,6 +168,9 @@ class TestIViewFixationReader(object):
             self.fixation_lines = f.readlines()
 
         self.EXPECTED_FIXATIONS = 8
+
+    def setup(self):
+        RecordingFixationFactory.slow_path_calls = []
         
     def test_reader_basically_works(self):
         fr = IViewFixationReader(filename=self.fix_file)
@@ -177,6 +195,36 @@ class TestIViewFixationReader(object):
 
         eq_(h.get('calibration_size'), [800,600])
 
+    def test_scanpath_contains_fixations(self):
+        ir = IViewFixationReader(self.fixation_lines)
+        scanpath = ir.scanpath()
+        eq_(self.EXPECTED_FIXATIONS, len(scanpath))
+        eq_('IViewFixation', type(scanpath[0]).__name__)
+        eq_((1125, 19017, 365),
+            (scanpath[0].start_num, scanpath[0].end_time, scanpath[0].x))
+
+    def test_scanpath_reads_extra_columns_on_fast_path(self):
+        lines = self.fixation_lines + ["1\t2\t3\t4\t5\t6\t7\t8\t9\n"]
+        ir = RecordingFixationReader(lines)
+        scanpath = ir.scanpath()
+        eq_(self.EXPECTED_FIXATIONS + 1, len(scanpath))
+        eq_(8, scanpath[-1].duration)
+        eq_(0, len(RecordingFixationFactory.slow_path_calls))
+
+    def test_scanpath_falls_back_for_bad_values(self):
+        lines = self.fixation_lines + ["1\t2\t3\t4\tfive\t6\t7\t8\n"]
+        ir = RecordingFixationReader(lines)
+        assert_raises(ValueError, ir.scanpath)
+        eq_(1, len(RecordingFixationFactory.slow_path_calls))
+
+    def test_scanpath_falls_back_for_huge_values(self):
+        huge = 10**20
+        lines = self.fixation_lines + ["1\t2\t3\t4\t%s\t6\t7\t8\n" % huge]
+        ir = RecordingFixationReader(lines)
+        scanpath = ir.scanpath()
+        eq_(1, len(RecordingFixationFactory.slow_path_calls))
+        eq_(huge, scanpath[-1].x)
+
 class TestTimelineReader(object):
     """ Exercise the TimelineReader """
     
@@ -8,7 +8,7 @@
 
 from __future__ import with_statement
 from gazehound.runners import fixation_statistics
-from gazehound import viewing
+from gazehound import viewing, shapes
 from ..testutils import includes_
 from nose.tools import *
 from .. import mock_objects
@@ -138,3 +138,25 @@ class TestFixationStatisticsAnalyzer(object):
         eq_(stats.start_ms, 18750)
         eq_(stats.end_ms, 34717)
         
+
+    def test_shape_stats_measures_time_in_shapes(self):
+        pres = self.timeline[1]
+        pres.shapes = [
+            shapes.Rectangle(300, 200, 400, 300, name='in'),
+            shapes.Ellipse(5, 5, 5, 5, name='out')]
+        shape_in, shape_out = self.gsa.shape_stats(pres)
+        eq_(51+712+498+2567, shape_in.time_in)
+        eq_(0, shape_out.time_in)
+        eq_(shape_out.end_ms - shape_out.start_ms, shape_out.time_out)
+
+    def test_shape_stats_reuse_presentation_stats(self):
+        for pres in self.timeline:
+            pres.shapes = [shapes.Rectangle(300, 200, 400, 300, name='in')]
+        self.timeline.has_shapes = True
+        stats = self.gsa.timeline_stats()
+        all_stats, shape_in = stats[2], stats[3]
+        eq_('in', shape_in.area)
+        eq_(all_stats.total_fixations, shape_in.total_fixations)
+        eq_(all_stats.distance_between_fixations,
+            shape_in.distance_between_fixations)
+        eq_(51+712+498+2567, shape_in.time_in)
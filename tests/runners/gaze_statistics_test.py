@@ -8,6 +8,7 @@
 
 from __future__ import with_statement
 from gazehound.runners import gaze_statistics
+from gazehound import shapes
 from ..testutils import includes_
 from nose.tools import *
 from .. import mock_objects
@@ -161,4 +162,18 @@ class TestGazeStatisticsAnalyzer(object):
         # I know this from looking at the file.
         invalid_count = 7
         eq_(stats.valid_lax, stats.total_points - invalid_count)
-        
\ No newline at end of file
+
+    def test_shape_stats_counts_points_in_shapes(self):
+        pres = self.timeline[0]
+        pres.shapes = [shapes.Rectangle(0, 0, 1000, 1000, name='big')]
+        shape_stats = self.gsa.shape_stats(pres)[0]
+        eq_('big', shape_stats.area)
+        eq_(self.gsa.timeline_stats()[0].valid_strict,
+            shape_stats.valid_strict)
+
+    def test_shape_stats_uses_passed_validity_counts(self):
+        pres = self.timeline[0]
+        pres.shapes = [shapes.Rectangle(0, 0, 1000, 1000, name='big')]
+        shape_stats = self.gsa.shape_stats(pres, 3, 4)[0]
+        eq_(3, shape_stats.valid_strict)
+        eq_(4, shape_stats.valid_lax)
@@ -45,6 +45,12 @@ class TestRectangle(object):
     def test_rectangle_knows_points_in(self):
         includes_(self.origin_rect, (50,50))
         
+    def test_rectangle_contains_points_matches_contains(self):
+        xs = [0, 50, 99, 100, -1]
+        ys = [0, 98, 50, 50, 50]
+        eq_([(x, y) in self.origin_rect for x, y in zip(xs, ys)],
+            self.origin_rect.contains_points(xs, ys).tolist())
+
     def test_to_matrix_creates_arrays_of_correct_size(self):
         mat = self.origin_rect.to_matrix()
         eq_(len(mat), 99)
@@ -72,6 +78,12 @@ class TestEllipse(object):
         includes_(self.ellipse, (50,90))
         includes_(self.ellipse, (50,10))
     
+    def test_ellipse_contains_points_matches_contains(self):
+        xs = [0, 50, 70, 71, 50]
+        ys = [0, 50, 50, 50, 90]
+        eq_([(x, y) in self.ellipse for x, y in zip(xs, ys)],
+            self.ellipse.contains_points(xs, ys).tolist())
+
     def test_height_and_width_work(self):
         h = self.ellipse.height()
         w = self.ellipse.width()